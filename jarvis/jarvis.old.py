@@ -1,4 +1,4 @@
-#! /usr/bin/env python2.7
+#! /usr/bin/env python3
 
 """Jerry-rigged Acronym Regarding Versioning Installed Software (jarvis)
 
@@ -28,15 +28,40 @@ Copyright:
     along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
-from __future__ import print_function
-from __future__ import unicode_literals
-
 import argparse
-from difflib import get_close_matches
-import json
+from bisect import bisect_left
+import codecs
+from collections import defaultdict
+from collections.abc import Mapping
+import hashlib
+import mmap
 import os
+import pickle
 import sys
-import textwrap
+
+# Use the fastest JSON library available, the stdlib is the last resort
+try:
+    import orjson
+except ImportError:
+    orjson = None
+    try:
+        import ujson as json
+        DUMP_OPTIONS = {'sort_keys': True}  # ujson output is always compact
+    except ImportError:
+        import json
+        DUMP_OPTIONS = {'sort_keys': True, 'separators': (',', ':')}
+
+# Stream only the attributes "list" needs if a full parse would be slow
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Parse without building Python objects of software "show" doesn't display
+try:
+    import simdjson
+except ImportError:
+    simdjson = None
 
 __author__ = 'Christopher Thornton, Alex Hyer'
 __email__ = 'theonehyer@gmail.com'
@@ -45,6 +70,60 @@ __maintainer__ = 'Alex Hyer'
 __status__ = 'Beta'
 __version__ = '1.0.0b10'
 
+# Software attributes stored in the database and editable by "edit"
+APPROVED_VALUES = frozenset([
+    'previous versions',
+    'description',
+    'version',
+    'commands',
+    'installation method',
+    'dependencies',
+    'categories'
+])
+
+# Attributes "show" can display in addition to version and description,
+# in the order they are displayed
+DISPLAY_FLAGS = (
+    'categories',
+    'commands',
+    'dependencies',
+    'installation method',
+    'previous versions'
+)
+
+# How "edit -e" combines an attribute's current and new value, keyed by
+# (sentinel, type of new value): "+,A,B" extends a list, "-" clears it and
+# any other value replaces the current one
+EDIT_OPERATIONS = {
+    ('+', list): lambda current, new: current + new[1:],
+    ('-', list): lambda current, new: [],
+    ('-', str): lambda current, new: '',
+}
+
+# Attributes read by "list", load_partial() skips all others
+LIST_FIELDS = ('version', 'description', 'categories')
+
+# List attributes whose values repeat across software, see intern_strings()
+INTERNED_LISTS = ('categories', 'dependencies')
+
+# Database used unless another is given with --database
+DATABASE = '/usr/local/etc/utils.json'
+
+# Rule drawn above and below each category header by "list -c"
+SEPARATOR = '-' * 79
+
+# Terminal column display_info() starts the second column at by default
+SECOND_COLUMN = 22
+INDENT = ' ' * SECOND_COLUMN
+
+# TextWrappers used by print_out(), keyed by (width, initial, subsequent)
+WRAPPERS = {}
+
+# Parser built by entry() on first use, reused if entry() runs again
+PARSER = None
+
+# Parsed databases are pickled here to skip reparsing unchanged JSON
+CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'jarvis')
 
 # TODO: Add tab-complete
 
@@ -80,11 +159,10 @@ class ParseCommas(argparse.Action):
         super(ParseCommas, self).__init__(option_strings, dest, **kwargs)
 
     def __call__(self, parser, namespace, values, option_string=None):
-        """Called by Argparse when user specifies multiple threads
+        """Called by Argparse when user specifies a comma-separated list
         
-        Simply asserts that the number of threads requested is greater than 0
-        but not greater than the maximum number of threads the computer
-        can support.
+        Split values by commas, strip whitespace from each item and drop
+        empty items, then add the resulting list to namespace.
         
         Args:
             
@@ -99,66 +177,198 @@ class ParseCommas(argparse.Action):
         Raises:
             
             TypeError: if values is not a string
-            
-            ValueError: if threads is less than one or greater than number of
-                        threads available on computer
         """
 
-        # This try/except should already be taken care of by Argparse
-        try:
-            assert type(values) is str
-        except AssertionError:
-            raise TypeError('{0} is not a string'.format(values))
+        # This should already be taken care of by Argparse, an explicit check
+        # unlike assert also survives python -O
+        if not isinstance(values, str):
+            raise TypeError(f'{values} is not a string')
 
-        try:
-            arguments = filter(None, values.split(','))
-        except AssertionError:
-            raise ValueError('{0} could not be parsed by commas'
-                             .format(values))
+        arguments = [value for value in
+                     (part.strip() for part in values.split(','))
+                     if value]
 
         setattr(namespace, self.dest, arguments)
 
 
-def autocomplete(query, possibilities, delta=0.75):
+class LazyDatabase(Mapping):
+    """Read-only database parsed by simdjson, converted as entries are used
+
+    simdjson parses the whole file in compiled code but only builds Python
+    objects for what is accessed, so looking up one software never builds
+    the metadata of all others.
+
+    Attributes:
+
+        document (simdjson.Object): parsed database
+
+        parser (simdjson.Parser): parser document belongs to, document is
+                                  only valid while it exists
+
+        entries (dict): entries already converted, keyed by software
+    """
+
+    def __init__(self, document, parser):
+        """Initialize class
+
+        Args:
+
+            document (simdjson.Object): parsed database
+
+            parser (simdjson.Parser): parser that parsed document
+        """
+
+        self.document = document
+        self.parser = parser
+        self.entries = {}
+
+    def __getitem__(self, software):
+        try:
+            return self.entries[software]
+        except KeyError:
+            entry = self.document[software].as_dict()
+            self.entries[software] = entry
+            return entry
+
+    def __iter__(self):
+        return iter(self.document.keys())
+
+    def __len__(self):
+        return len(self.document)
+
+
+class NameIndex(object):
+    """Case-insensitive sorted index of software names
+
+    Lowercase names are kept in a sorted list so all names beginning with a
+    prefix form one contiguous run that is found by two binary searches.
+    The original-case names are also sorted once so callers listing
+    software in order never need to sort it themselves.
+
+    Attributes:
+
+        software (list): sorted list of unicodes of original-case names
+
+        original (dict): maps lowercase names to their original case
+
+        names (list): sorted list of unicodes of lowercase names
+    """
+
+    def __init__(self, words=()):
+        """Initialize index from all words
+
+        Args:
+
+            words (iterable): unicodes to index
+        """
+
+        self.software = sorted(words)
+        self.original = {word.lower(): word for word in self.software}
+        self.names = sorted(self.original)
+
+    def find_prefix(self, prefix):
+        """Find all names beginning with prefix
+
+        Args:
+
+            prefix (unicode): lowercase prefix to search for
+
+        Returns:
+            list: sorted list of unicodes of all lowercase names beginning
+                  with prefix, including prefix itself if it is a name
+        """
+
+        # Names beginning with prefix sort before its successor, prefix with
+        # its last character incremented. Trailing characters that can't be
+        # incremented are dropped first, the empty prefix has no successor.
+        start = bisect_left(self.names, prefix)
+        stem = prefix.rstrip(chr(sys.maxunicode))
+        if stem == '':
+            return self.names[start:]
+        successor = stem[:-1] + chr(ord(stem[-1]) + 1)
+        end = bisect_left(self.names, successor, lo=start)
+
+        return self.names[start:end]
+
+
+def autocomplete(query, names, delta=0.75):
     """Attempts to figure out what possibility the query is
     
     Args:
         
         query (unicode): query to attempt to complete
         
-        possibilities (list): list of unicodes of possible answers for query
+        names (NameIndex): index of possible answers for query
         
         delta (float): minimum delta similarity between query and
                        any given possibility for possibility to be considered.
-                       Delta used by difflib.get_close_matches().
+                       Delta used by rapidfuzz if installed, else by
+                       difflib.get_close_matches().
         
     Returns:
-        unicode: best guess of correct answer
+        unicode: best guess of correct answer in its original case, empty
+                 string if no possibility is similar enough
                  
     Example:
-    >>> autocomplete('bowtei', ['bowtie2', 'bot']
-    'bowtie2'
+    >>> autocomplete('bowtei', NameIndex(['Bowtie2', 'bot'])
+    'Bowtie2'
     """
 
-    possibilities = [possibility.lower() for possibility in possibilities]
+    query = query.lower()
 
     # Don't waste time for exact matches
-    if query in possibilities:
-        return query
-
-    # Complete query as much as possible
-    options = [word for word in possibilities if word.startswith(query)]
-    if len(options) > 0:
+    if query in names.original:
+        return names.original[query]
+
+    # Complete query as much as possible, a unique completion or one that
+    # is itself a name is what the matchers would pick with a perfect score
+    options = names.find_prefix(query)
+    if len(options) == 1:
+        return names.original[options[0]]
+    elif len(options) > 0:
         possibilities = options
         query = max_substring(options)
+        if query in names.original:
+            return names.original[query]
+    else:
+        possibilities = names.names
+
+    # Identify possible matches and return best match, the matchers are
+    # only imported here so exact matches don't pay for them at startup.
+    # rapidfuzz's scores are close to difflib's ratio() but not identical,
+    # ties go to the greatest name as get_close_matches() would pick.
+    try:
+        from rapidfuzz import fuzz, process
+    except ImportError:
+        from difflib import get_close_matches
+        matches = get_close_matches(query, possibilities, cutoff=delta)
+        best = matches[0] if matches else None
+    else:
+        hits = process.extract(query, possibilities, scorer=fuzz.ratio,
+                               score_cutoff=delta * 100, limit=None)
+        best = max(hits, key=lambda hit: (hit[1], hit[0]))[0] if hits \
+            else None
 
-    # Identify possible matches and return best match
-    matches = get_close_matches(query, possibilities, cutoff=delta)
+    return names.original[best] if best is not None else ''
 
-    return matches[0]
 
+def cache_path(database_name):
+    """Return path of the pickle cache of a database
 
-def display_info(first, second, second_col_start=22):
+    Args:
+
+        database_name (unicode): path of the JSON-formatted database
+
+    Returns:
+        unicode: path of the cache file in CACHE_DIR
+    """
+
+    path = os.path.abspath(database_name).encode('utf-8')
+
+    return os.path.join(CACHE_DIR, hashlib.md5(path).hexdigest() + '.pkl')
+
+
+def display_info(first, second, second_col_start=SECOND_COLUMN, buf=None):
     """Convenience function to print data into two columns
     
     Note: Uses print_out from jarvis.py.
@@ -172,18 +382,27 @@ def display_info(first, second, second_col_start=22):
          second_col_start (int): number of terminal columns before column two
                                  starts. If first is longer than this argument,
                                  second will begin on a new line.
+
+         buf (list): collect output lines here instead of printing them
     """
 
-    indent = ' ' * second_col_start
+    # Past edits could leave attributes as null
+    second = '' if second is None else str(second)
+
+    if second_col_start == SECOND_COLUMN:
+        indent = INDENT
+    else:
+        indent = ' ' * second_col_start
+
     if len(first) > second_col_start:
-        print_out(first)
-        print_out(second, initial=indent, subsequent=indent)
+        print_out(first, buf=buf)
+        print_out(second, initial=indent, subsequent=indent, buf=buf)
     else:
-        print_out("{0:<{1}}{2}".format(first, second_col_start, second),
-                  subsequent=indent)
+        print_out(first.ljust(second_col_start) + second, subsequent=indent,
+                  buf=buf)
 
 
-def extract_data(software, data, brief=False):
+def extract_data(software, data, brief=False, entry=None):
     """Extracts information from software for printing
 
     Formats data from program into two strings. These strings are intended
@@ -197,30 +416,208 @@ def extract_data(software, data, brief=False):
         
         brief (bool): return program version and description if True, 
                       else return empty string for second value
-                      
+
+        entry (dict): data[software] if the caller already looked it up
+
     Returns:
         tuple: (unicode, unicode) first str contains program name and optional 
                version, second str contains program description
     """
 
-    # Add version to output if possible unless brief is True
-    version = data[software]['version']
+    if entry is None:
+        entry = data[software]
+
+    # Add version to output if possible unless brief is True, a missing
+    # version is treated like an empty one
+    version = entry.get('version')
     if brief is True:
         col_one = software
     elif version:
-        col_one = '{}({}): '.format(software, version)
+        col_one = f'{software}({version}): '
     else:
         col_one = software
 
-    # Add program description to output unless brief is False
+    # Add program description to output unless brief is False, past edits
+    # could leave it as null
     if brief is False:
-        col_two = data[software]['description']
+        col_two = entry.get('description') or ''
     else:
         col_two = ''
 
     return col_one, col_two  # Send data for output
 
 
+def intern_strings(data):
+    """Make equal names and repeated attribute values share one string
+
+    Identical strings then compare by identity before their characters are
+    compared and values repeated across software, such as categories,
+    dependencies and installation methods, are only stored once.
+
+    Args:
+
+        data (dict): Dictionary containing available software and
+                     metadata about the programs
+
+    Returns:
+        dict: data with interned keys, categories, dependencies and
+              installation methods
+    """
+
+    interned = {}
+    for software, entry in data.items():
+        for attribute in INTERNED_LISTS:
+            if attribute in entry:
+                entry[attribute] = [sys.intern(value)
+                                    for value in entry[attribute]]
+        method = entry.get('installation method')
+        if isinstance(method, str):  # Past edits could leave it as null
+            entry['installation method'] = sys.intern(method)
+        interned[sys.intern(software)] = entry
+
+    return interned
+
+
+def json_dump(data, handle):
+    """Write data to a file as compact JSON with sorted keys
+
+    The fastest library available is used. json and ujson stream the encoded
+    data into the file instead of building the whole string in memory first,
+    orjson serializes to bytes in C and writes them at once.
+
+    Args:
+
+        data (dict): data to serialize
+
+        handle (file): handle open for writing in binary mode
+    """
+
+    if orjson is not None:
+        handle.write(orjson.dumps(data, option=orjson.OPT_SORT_KEYS))
+    else:
+        json.dump(data, codecs.getwriter('utf-8')(handle), **DUMP_OPTIONS)
+
+
+def json_load(handle):
+    """Parse a JSON-formatted file using the fastest library
+
+    orjson has no load(), it parses a memory map of the file instead so
+    the file is neither copied into nor decoded to a str first.
+
+    Args:
+
+        handle (file): open handle of JSON-formatted file
+
+    Returns:
+        dict: parsed data
+    """
+
+    if orjson is not None:
+        try:
+            mapping = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):  # Empty files and pipes can't be mapped
+            return orjson.loads(handle.read())
+        with mapping, memoryview(mapping) as view:
+            return orjson.loads(view)
+
+    return json.load(handle)
+
+
+def load_database(database, use_cache=True, fields=None, lazy=False):
+    """Load JSON database, reusing a pickled copy if the file is unchanged
+
+    The cache is keyed by the absolute path of the database and only used if
+    the modification time and size of the database match those recorded when
+    the cache was written. Any other cache state results in the JSON being
+    parsed and the cache being rewritten.
+
+    Args:
+
+        database (file): open handle of the JSON-formatted database
+
+        use_cache (bool): read and write the pickle cache if True
+
+        fields (tuple): attributes the caller needs, if given, use_cache
+                        is False and the database must be parsed without
+                        orjson, only these are streamed out with ijson
+
+        lazy (bool): if True and simdjson is installed, return a read-only
+                     LazyDatabase instead of reading the cache, for callers
+                     that only look at a few entries
+
+    Returns:
+        dict: Dictionary containing available software and metadata
+              about the programs
+    """
+
+    # Unpickling a large cache builds every entry, simdjson only those used
+    if lazy is True and simdjson is not None:
+        parser = simdjson.Parser()
+        handle = getattr(database, 'buffer', database)
+        return LazyDatabase(parser.parse(handle.read()), parser)
+
+    # orjson parses the whole file faster than ijson streams part of it.
+    # With the cache a miss parses everything once so that later runs can
+    # unpickle it, which beats streaming every time.
+    if use_cache is False:
+        if fields is not None and ijson is not None and orjson is None:
+            return intern_strings(load_partial(database, fields))
+        return intern_strings(json_load(database))
+
+    stats = os.fstat(database.fileno())
+    signature = (stats.st_mtime_ns, stats.st_size)
+    cache_name = cache_path(database.name)
+
+    try:
+        with open(cache_name, 'rb') as cache_handle:
+            if pickle.load(cache_handle) == signature:
+                return pickle.load(cache_handle)
+    except (EOFError, OSError, ValueError, pickle.UnpicklingError):
+        pass  # Missing, stale or unreadable caches are simply rebuilt
+
+    # Pickling keeps interned strings shared when loading from the cache
+    data = intern_strings(json_load(database))
+
+    # Write to a private file and rename it over the cache so concurrent
+    # runs never read a partially written cache
+    temp_name = f'{cache_name}.{os.getpid()}'
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(temp_name, 'wb') as cache_handle:
+            pickle.dump(signature, cache_handle, pickle.HIGHEST_PROTOCOL)
+            pickle.dump(data, cache_handle, pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_name, cache_name)
+    except OSError:
+        pass  # Caching only speeds up loading, never fail because of it
+
+    return data
+
+
+def load_partial(database, fields):
+    """Stream a JSON database, keeping only some attributes of each software
+
+    Each entry is parsed and trimmed before the next one is read so the
+    skipped attributes of all software are never held at once.
+
+    Args:
+
+        database (file): open handle of the JSON-formatted database
+
+        fields (tuple): attributes to keep, missing ones are left out
+
+    Returns:
+        dict: Dictionary containing available software and the requested
+              metadata about the programs
+    """
+
+    # ijson is fastest on bytes, text handles wrap a binary buffer
+    handle = getattr(database, 'buffer', database)
+
+    return {software: {field: entry[field] for field in fields
+                       if field in entry}
+            for software, entry in ijson.kvitems(handle, '')}
+
+
 def max_substring(words, last_letter='', position=0):
     """Finds max substring shared by all strings starting at position
 
@@ -228,9 +625,9 @@ def max_substring(words, last_letter='', position=0):
 
         words (list): list of unicode of all words to compare
 
-        last_letter (unicode): letter of last common letter, only for use
-                               internally unless you really know what 
-                               you are doing
+        last_letter (unicode): string to prepend to the substring, kept for
+                               compatibility with the former recursive
+                               implementation
 
         position (int): starting position in each word to begin analyzing
                         for substring
@@ -247,19 +644,15 @@ def max_substring(words, last_letter='', position=0):
     ''
     """
 
-    # If end of word is reached, begin reconstructing the substring
-    try:
-        letter = [word[position] for word in words]
-    except IndexError:
-        return last_letter
-
-    # Recurse if position matches, else begin reconstructing the substring
-    if all(l == letter[0] for l in letter) is True:
-        last_letter += max_substring(words, last_letter=letter[0],
-                                     position=position + 1)
-        return last_letter
-    else:
-        return last_letter
+    # zip() stops at the end of the shortest word, so each column holds
+    # one letter of every word at the same position
+    common = []
+    for letters in zip(*(word[position:] for word in words)):
+        if any(letter != letters[0] for letter in letters):
+            break
+        common.append(letters[0])
+
+    return last_letter + ''.join(common)
 
 
 def relevant_values(all_values, approved_values=None):
@@ -275,29 +668,51 @@ def relevant_values(all_values, approved_values=None):
         
         all_values (list): list of unicode all values to filter
         
-        approved_values (list): list of unicode of values to use as filter
+        approved_values (iterable): unicodes of values to use as filter
     
     Returns:
         
         list: list of values from all_values also found in approved_values
     """
 
-    # Default approved values if none given
+    # Default approved values if none given, any others are frozen so each
+    # membership test is O(1) whatever iterable the caller passed
     if approved_values is None:
-        approved_values = [
-            'previous versions',
-            'description',
-            'version',
-            'commands',
-            'installation method',
-            'dependencies',
-            'categories'
-        ]
+        approved_values = APPROVED_VALUES
+    else:
+        approved_values = frozenset(approved_values)
 
     return [value for value in all_values if value in approved_values]
 
 
-def sub_display(args, data):
+def suggest(query, names, limit=5, cutoff=0.6):
+    """Print names similar to a query that autocomplete() could not resolve
+
+    cutoff is below autocomplete()'s default delta so near misses that were
+    too dissimilar to pick automatically are still offered to the user.
+
+    Args:
+
+        query (unicode): query that did not match any software
+
+        names (NameIndex): index of possible answers for query
+
+        limit (int): maximum number of suggestions to print
+
+        cutoff (float): minimum similarity between query and a suggestion,
+                        as used by difflib.get_close_matches()
+    """
+
+    from difflib import get_close_matches
+    matches = get_close_matches(query.lower(), names.names, n=limit,
+                                cutoff=cutoff)
+
+    if matches:
+        suggestions = ', '.join(names.original[match] for match in matches)
+        print_out(f'Did you mean: {suggestions}?')
+
+
+def sub_display(args, data, names):
     """Displays data on selected software, invoked by "show" on the CML
 
         Args:
@@ -306,38 +721,45 @@ def sub_display(args, data):
 
             data (dict): Dictionary containing available software and
                          metadata about the programs
+
+            names (NameIndex): index of the software names in data
     """
 
-    all_args = vars(args)
-    software = autocomplete(args.software, data.keys())
+    software = autocomplete(args.software, names)
 
     if software == '':
-        print_out('"{0}" not in database. Try using "jarvis list --brief".')
+        print_out(f'"{args.software}" not in database. Try using '
+                  f'"jarvis list --brief".')
+        suggest(args.software, names)
         sys.exit(1)
 
+    entry = data[software]
+
     # Print basic software data universal to all software
-    col_one, col_two = extract_data(software, data)
+    col_one, col_two = extract_data(software, data, entry=entry)
     display_info(col_one, col_two)
 
-    # Filter through requested args and output if available
-    flags = [value for arg, value in all_args.iteritems()
-             if value in data[software].keys() and value is not None]
-    for flag in sorted(flags):
+    # Filter through requested args and output if available, iterating
+    # DISPLAY_FLAGS instead of sorting the requested flags on each call.
+    # Each flag is stored under the name of the attribute it displays.
+    flags = [flag for flag in DISPLAY_FLAGS
+             if getattr(args, flag) is True and flag in entry]
+    for flag in flags:
         header = flag + ': '
 
-        if isinstance(data[software][flag], list):
-            value = ', '.join(sorted(data[software][flag]))
+        if isinstance(entry[flag], list):
+            value = ', '.join(sorted(entry[flag]))
         else:
-            value = data[software][flag]
+            value = entry[flag]
 
-        if value == '':
+        if value is None or value == '':  # Past edits could leave null
             value = 'N/A'
 
         display_info(header, value)
 
 
 # TODO: Add interactive mode
-def sub_edit(args, data):
+def sub_edit(args, data, names):
     """Edits software in the database, invoked by "edit" on the CML
 
         Args:
@@ -346,13 +768,22 @@ def sub_edit(args, data):
 
             data (dict): Dictionary containing available software and
                          metadata about the programs
+
+            names (NameIndex): index of the software names in data
     """
 
     all_args = vars(args)
+    dirty = False  # Only rewrite the database if data was changed
+
+    # Attributes not given on the command line hold their defaults, None or
+    # '', and must never overwrite existing data
+    attributes = relevant_values(attribute for attribute, value
+                                 in all_args.items()
+                                 if value is not None and value != '')
 
     # Determine if software is in the database
     if args.append is False:
-        match = autocomplete(args.software, data.keys())
+        match = autocomplete(args.software, names) or False
     else:
         match = False
 
@@ -360,44 +791,44 @@ def sub_edit(args, data):
     if args.remove is True:
         if match is not False:
             while True:
-                answer = raw_input('Delete "{0}" [y, n]? '.format(match))
+                answer = input(f'Delete "{match}" [y, n]? ')
                 if answer.lower() == 'y':
                     del data[match]
+                    dirty = True
                     break
                 elif answer.lower() == 'n':
                     sys.exit(0)
                 else:
-                    print('"{}" is not a valid option'.format(answer))
+                    print(f'"{answer}" is not a valid option')
         else:
-            print_out('"{}" does not exists in the database of available '
-                      'software. Nothing done.'.format(args.software))
+            print_out(f'"{args.software}" does not exists in the database of '
+                      f'available software. Nothing done.')
+            suggest(args.software, names)
             sys.exit(1)
 
     # Edit software data in database
     elif args.edit is True:
         if match is not False:
-            attributes = relevant_values(all_args.keys())
             for attribute in attributes:
-                if isinstance(all_args[attribute], list) and \
-                                all_args[attribute][0] == '+':
-                    all_args[attribute].remove('+')
-                    data[match][attribute].extend(all_args[attribute])
-                elif isinstance(all_args[attribute], list) and \
-                        all_args[attribute][0] == '-':
-                    data[match][attribute] = []
-                elif isinstance(all_args[attribute], str) and \
-                        all_args[attribute] == '-':
-                    data[match][attribute] = ''
+                value = all_args[attribute]
+                if isinstance(value, list):
+                    key = (value[0] if value else None, list)
                 else:
-                    data[match][attribute] = all_args[attribute]
+                    key = (value, type(value))
+                operation = EDIT_OPERATIONS.get(key)
+                if operation is not None:
+                    value = operation(data[match][attribute], value)
+                data[match][attribute] = value
+                dirty = True
         else:
-            print_out('"{0}" does not exists in database. Nothing to edit.'
-                      .format(args.software))
+            print_out(f'"{args.software}" does not exists in database. '
+                      f'Nothing to edit.')
+            suggest(args.software, names)
 
     elif args.append:
         if args.software in data.keys():
-            print_out('"{0}" already exists in database. Use "utils edit -e '
-                      '<software>" to modify an entry'.format(args.software))
+            print_out(f'"{args.software}" already exists in database. Use '
+                      f'"utils edit -e <software>" to modify an entry')
             sys.exit(1)
         else:
             data[args.software] = {'description': '',
@@ -408,18 +839,45 @@ def sub_edit(args, data):
                                    'dependencies': [],
                                    'categories': []
                                    }
-            attributes = relevant_values(all_args.keys())
             for attribute in attributes:
                 data[args.software][attribute] += all_args[attribute]
+            dirty = True
 
-    # Write changes to the database by rewriting all data
-    database_name = args.database.name
-    args.database.close()
-    with open(database_name, 'w') as database_handle:
-        database_handle.write(json.dumps(data, sort_keys=True))
+    if dirty is False:
+        return
+
+    # Drop the cache first so it can never outlive the data it copies
+    try:
+        os.remove(cache_path(args.database))
+    except OSError:
+        pass  # No cache to invalidate
+
+    # Write changes to a file next to the database and rename it over the
+    # database, so a failed write can never leave a truncated database.
+    # Symlinks are resolved so the file they point at is the one replaced.
+    path = os.path.realpath(args.database)
+    stats = os.stat(path)
+    temp_name = f'{path}.tmp'
+    try:
+        temp_handle = open(temp_name, 'wb')
+    except OSError:  # Directory isn't writable, the database may still be
+        with open(path, 'wb') as handle:
+            json_dump(data, handle)
+        return
+
+    with temp_handle:
+        os.fchmod(temp_handle.fileno(), stats.st_mode & 0o7777)
+        try:
+            os.fchown(temp_handle.fileno(), -1, stats.st_gid)
+        except OSError:
+            pass  # Only members of the group may keep it
+        json_dump(data, temp_handle)
+        temp_handle.flush()
+        os.fsync(temp_handle.fileno())
+    os.replace(temp_name, path)
 
 
-def sub_list(args, data):
+def sub_list(args, data, names):
     """Lists available software from data
 
         Args:
@@ -428,51 +886,66 @@ def sub_list(args, data):
 
             data (dict): Dictionary containing available software and
                          metadata about the software
+
+            names (NameIndex): index of the software names in data
     """
 
+    # Invert data once so each category is a single lookup, iterating sorted
+    # software keeps each category's list sorted
+    if args.list_categories or args.categories:
+        category_index = defaultdict(list)
+        for software in names.software:  # Not all software has a category
+            for category in set(data[software].get('categories', ())):
+                category_index[category].append(software)
+
+    # Lines are collected and written at once, printing each line
+    # separately flushes a line-buffered terminal for every software
+    buf = []
+
     # List available categories
     if args.list_categories:
-        categories = []
-        for software in sorted(data):
-            try:  # Not the fastest algorithm, but not much data here, so eh
-                software_categories = data[software]['categories']
-                for category in software_categories:
-                    if category not in categories:
-                        categories.append(category)
-            except KeyError:
-                pass  # Skip software if it doesn't have a category
-        print(os.linesep.join(sorted(categories)))
+        print(os.linesep.join(sorted(category_index)))
 
     # List software in category
     elif args.categories:
+        rows = {}  # Software in several categories is only formatted once
         for category in args.categories:
-            print()  # Print format header
-            print('-' * 79)
-            print('{0}'.format(category).center(79))
-            print('-' * 79)
-            exists = False  # Track if category found
-            for software in sorted(data):
-                try:  # Not all software will have a category
-                    software_categories = data[software]['categories']
-                    if category in software_categories:
-                        col1, col2 = extract_data(software, data,
-                                                  brief=args.brief)
-                        display_info(col1, col2)
-                        exists = True  # At least one software in category
-                except KeyError:
-                    pass
-            if not exists:
-                print('No such category: {0}'.format(category))
-                print('Use --list_categories to view possible categories')
+            buf.append(f'\n{SEPARATOR}\n{category.center(79)}\n'
+                       f'{SEPARATOR}\n')  # Print format header
+            for software in category_index.get(category, ()):
+                if software not in rows:
+                    col1, col2 = extract_data(software, data,
+                                              brief=args.brief,
+                                              entry=data[software])
+                    lines = []
+                    display_info(col1, col2, buf=lines)
+                    rows[software] = ''.join(lines)
+                buf.append(rows[software])
+            if category not in category_index:
+                buf.append(f'No such category: {category}\n')
+                buf.append('Use --list_categories to view possible '
+                           'categories\n')
 
     # List all software if no other arguments given
     else:
-        for software in sorted(data):
-            col1, col2 = extract_data(software, data, brief=args.brief)
-            display_info(col1, col2)
+        for software in names.software:
+            col1, col2 = extract_data(software, data, brief=args.brief,
+                                      entry=data[software])
 
+            # Most software fits on one line, build it here as display_info
+            # and print_out would instead of calling them for every row
+            col2 = '' if col2 is None else str(col2)
+            line = col1.ljust(SECOND_COLUMN) + col2
+            if len(col1) <= SECOND_COLUMN and len(line) <= 79 \
+                    and line.isprintable():
+                buf.append(line.rstrip(' ') + '\n')
+            else:
+                display_info(col1, col2, buf=buf)
 
-def print_out(line, width=79, initial='', subsequent=''):
+    sys.stdout.write(''.join(buf))
+
+
+def print_out(line, width=79, initial='', subsequent='', buf=None):
     """Convenience function that wraps output before printing it
     
     Args:
@@ -484,7 +957,10 @@ def print_out(line, width=79, initial='', subsequent=''):
         initial (unicode): string to prepend to first line
         
         subsequent (unicode): string to append to each line after first
-        
+
+        buf (list): append the wrapped line, ending in a newline, here
+                    instead of printing it
+
     Example:
         >>> print_out('print this line', width=15, initial='first ', 
         ... subsequent='not first ')
@@ -492,9 +968,117 @@ def print_out(line, width=79, initial='', subsequent=''):
         not first this
         not first line
     """
-    output = textwrap.fill(line, width, initial_indent=initial,
-                           subsequent_indent=subsequent)
-    print(output)
+    # Most lines already fit, format them as TextWrapper would without
+    # wrapping: printable excludes tabs and newlines it would replace
+    if line.isprintable() and len(initial) + len(line) <= width:
+        line = line.rstrip(' ')  # TextWrapper drops trailing whitespace
+        wrapped = initial + line if line else ''
+    else:
+        wrapped = wrap_ascii(line, width, initial, subsequent)
+
+    # textwrap.fill() builds a new TextWrapper on every call, reuse them
+    if wrapped is None:
+        key = (width, initial, subsequent)
+        try:
+            wrapper = WRAPPERS[key]
+        except KeyError:
+            import textwrap  # Deferred until output actually needs wrapping
+            wrapper = textwrap.TextWrapper(width=width,
+                                           initial_indent=initial,
+                                           subsequent_indent=subsequent)
+            WRAPPERS[key] = wrapper
+        wrapped = wrapper.fill(line)
+
+    if buf is None:
+        print(wrapped)
+    else:
+        buf.append(wrapped + '\n')
+
+
+def wrap_ascii(line, width, initial, subsequent):
+    """Wrap a line of ASCII words separated by single spaces
+
+    Greedily fills each line like TextWrapper but without its regular
+    expression splitting. Only lines wrapped identically by both are
+    accepted, which covers nearly all descriptions.
+
+    Args:
+
+        line (unicode): string to wrap
+
+        width (int): number of characters per line in output
+
+        initial (unicode): string to prepend to first line
+
+        subsequent (unicode): string to prepend to each line after first
+
+    Returns:
+        unicode: wrapped line, None if line has hyphens, runs of whitespace,
+                 non-ASCII characters or words too long for a line, all of
+                 which TextWrapper handles specially
+    """
+
+    if not line.isascii() or not line.isprintable() or '-' in line \
+            or '  ' in line or line != line.strip(' '):
+        return None
+
+    # TextWrapper splits words longer than the room left by either
+    # indent, even if they would fit on a line with the shorter indent
+    words = line.split(' ')
+    if max(map(len, words)) > width - max(len(initial), len(subsequent)):
+        return None
+
+    pieces = [initial, words[0]]
+    column = len(initial) + len(words[0])
+    for word in words[1:]:
+        if column + 1 + len(word) <= width:
+            pieces.append(' ')
+            column += 1 + len(word)
+        else:
+            pieces.append('\n')
+            pieces.append(subsequent)
+            column = len(subsequent) + len(word)
+        pieces.append(word)
+
+    return ''.join(pieces)
+
+
+def fast_parse(argv):
+    """Parse the most common command lines without building the full parser
+
+    "jarvis list" and "jarvis show SOFTWARE" without any flags are by far the
+    most common invocations, and constructing every subparser costs more
+    than running them. This mimics the args argparse would produce for them.
+
+    Args:
+
+        argv (list): list of unicodes of command line arguments, excluding
+                     the program name
+
+    Returns:
+        Namespace: args as argparse would create them, None if argv is any
+                   other command line, which argparse must handle
+    """
+
+    if len(argv) == 1 and argv[0] == 'list':
+        args = argparse.Namespace(func=sub_list,
+                                  command='list',
+                                  brief=False,
+                                  categories=None,
+                                  list_categories=False)
+    elif len(argv) == 2 and argv[0] == 'show' \
+            and not argv[1].startswith('-'):
+        args = argparse.Namespace(func=sub_display,
+                                  command='show',
+                                  software=argv[1],
+                                  **dict.fromkeys(DISPLAY_FLAGS, False))
+    else:
+        return None
+
+    args.database = DATABASE
+    args.cache = True
+
+    return args
 
 
 def main(args):
@@ -505,7 +1089,22 @@ def main(args):
         args (ArgumentParser): args to control program flow
     """
 
-    args.func(args, json.load(args.database))  # Run function defined by args
+    fields = LIST_FIELDS if args.func is sub_list else None
+    lazy = args.func is sub_display  # Only ever reads a single entry
+
+    # The database is only opened once a command needs it, so --help and
+    # usage errors never touch it. Every parser takes bytes, opening it in
+    # binary skips decoding and newline translation.
+    try:
+        database = open(args.database, 'rb')
+    except OSError as error:
+        sys.exit(f"can't open '{args.database}': {error.strerror}")
+    with database:
+        data = load_database(database, use_cache=args.cache, fields=fields,
+                             lazy=lazy)
+    names = NameIndex(data)  # Sorted once so lookups are O(log N)
+
+    args.func(args, data, names)  # Run function defined by args
 
 
 def entry():
@@ -517,6 +1116,27 @@ def entry():
     jarvis by calling main and passing args via the API.
     """
 
+    global PARSER
+
+    args = fast_parse(sys.argv[1:])
+    if args is not None:
+        main(args)
+        sys.exit(0)
+
+    if PARSER is None:
+        PARSER = build_parser()
+    main(PARSER.parse_args())
+
+    sys.exit(0)
+
+
+def build_parser():
+    """Build the command line parser for all subcommands
+
+    Returns:
+        ArgumentParser: parser whose parse_args() returns the args for main()
+    """
+
     parser = argparse.ArgumentParser(description=__doc__,
                                      formatter_class=
                                      argparse.RawDescriptionHelpFormatter)
@@ -530,12 +1150,20 @@ def entry():
     db_parser.add_argument('-b',
                            '--database',
                            metavar="DB",
-                           default="/usr/local/etc/utils.json",
-                           type=argparse.FileType('rU'),
+                           default=DATABASE,
                            help='use a custom JSON-formatted database file ['
                                 'default: /usr/local/etc/utils.json]')
-
+    db_parser.add_argument('--no-cache',
+                           dest='cache',
+                           action='store_false',
+                           help='always parse the database instead of using '
+                                'the cached copy in ~/.cache/jarvis')
+
+    # Python 3 subparsers are optional unless required, and need a dest for
+    # the error message naming the missing command
     subparsers = parser.add_subparsers(title='subcommands',
+                                       dest='command',
+                                       required=True,
                                        help='exactly one of these commands '
                                             'is required')
 
@@ -628,30 +1256,27 @@ def entry():
                                                 'about software')
     flag_group = display_parser.add_argument_group('flags')
     flag_group.add_argument('-p', '--prev',
-                            action='store_const',
-                            const='previous versions',
+                            dest='previous versions',
+                            action='store_true',
                             help='list former versions of the search item')
     flag_group.add_argument('-c', '--commands',
-                            action='store_const',
-                            const='commands',
+                            action='store_true',
                             help='list available commands provided by program')
     flag_group.add_argument('-t', '--categories',
-                            action='store_const',
-                            const='categories',
+                            action='store_true',
                             help='list of categories the search item fits in')
     flag_group.add_argument('-i', '--installation',
-                            action='store_const',
-                            const='installation method',
+                            dest='installation method',
+                            action='store_true',
                             help='display method used to install software')
     flag_group.add_argument('-d', '--depends',
-                            action='store_const',
-                            const='dependencies',
+                            dest='dependencies',
+                            action='store_true',
                             help='list software dependencies')
     display_parser.set_defaults(func=sub_display)
 
-    main(parser.parse_args())
+    return parser
 
-    sys.exit(0)
 
 if __name__ == '__main__':
     entry()
@@ -5,7 +5,9 @@ Contains various functions for use by jarvis.py
 """
 
 import argparse
-from difflib import get_close_matches
+from bisect import bisect_left
+import os
+import sys
 
 __author__ = 'Alex Hyer, Christopher Thornton'
 __email__ = 'theonehyer@gmail.com'
@@ -14,6 +16,17 @@ __maintainer__ = 'Alex Hyer'
 __status__ = 'Alpha'
 __version__ = '2.0.0a3'
 
+# Vocabularies built for immutable possibilities passed to autocorrect(),
+# keyed by id(). Each entry keeps its possibilities alive so the id can't
+# be reused by another object while it is cached.
+VOCABULARIES = {}
+
+# Number of vocabularies kept before VOCABULARIES is emptied
+MAX_VOCABULARIES = 32
+
+# Number of answers a Vocabulary keeps before they are emptied
+MAX_ANSWERS = 1024
+
 
 class ParseCommas(argparse.Action):
     """Argparse Action that parses arguments by commas
@@ -47,7 +60,7 @@ class ParseCommas(argparse.Action):
     def __call__(self, parser, namespace, value, option_string=None):
         """Called by Argparse when user specifies a comma-separated list
 
-        Simply split list by commas and add to namespace.
+        Simply split list by commas and add to namespace as a tuple.
 
         Args:
             parser (ArgumentParser): parser used to generate values
@@ -59,71 +72,257 @@ class ParseCommas(argparse.Action):
             option_string (str): argument flag used to call this function
 
         Raises:
-            TypeError: if values is not a string
-
-            ValueError: if value cannot, for any reason, be parsed
-                        by commas
+            TypeError: if value is not a string
         """
 
-        # This try/except should already be taken care of by Argparse
-        try:
-            assert type(value) is str
-        except AssertionError:
+        # Argparse only passes strings, direct callers might not
+        if not isinstance(value, str):
             raise TypeError('{0} is not a string'.format(value))
 
-        try:
-            arguments = filter(None, value.split(','))
-        except AssertionError:
-            raise ValueError('{0} could not be parsed by commas'
-                             .format(value))
+        # A tuple, unlike filter() on Python 3, can be iterated repeatedly
+        # and is hashable so parsed arguments can key caches. Filling it
+        # from filter() measured faster than from a generator or a list.
+        arguments = tuple(filter(None, value.split(',')))
 
         setattr(namespace, self.dest, arguments)
 
 
+class Vocabulary(object):
+    """Lowercase possibilities of autocorrect(), built once per word list
+
+    Words are kept sorted so all words beginning with a prefix form one
+    contiguous run found by two binary searches.
+
+    Attributes:
+        words (list): sorted list of unicodes of unique lowercase
+                      possibilities
+
+        lookup (frozenset): words for O(1) exact match tests
+
+        answers (dict): answers of autocorrect() for these words, keyed by
+                        (lowercase query, delta), None if nothing matched.
+                        Emptied once it holds MAX_ANSWERS answers.
+    """
+
+    def __init__(self, possibilities):
+        """Initialize class and lowercase every possibility
+
+        Args:
+            possibilities (iterable): unicodes of possible answers
+        """
+
+        self.lookup = frozenset(possibility.lower()
+                                for possibility in possibilities)
+        self.words = sorted(self.lookup)
+        self.answers = {}
+
+    def find_prefix(self, prefix):
+        """Find all words beginning with prefix
+
+        Args:
+            prefix (unicode): lowercase prefix to search for
+
+        Returns:
+            list: sorted list of unicodes of all words beginning with prefix
+        """
+
+        # Run ends before the next string after every word beginning with
+        # prefix, sys.maxunicode can't be incremented
+        start = bisect_left(self.words, prefix)
+        stem = prefix.rstrip(chr(sys.maxunicode))
+        if stem == '':
+            return self.words[start:]
+        end = bisect_left(self.words, stem[:-1] + chr(ord(stem[-1]) + 1),
+                          lo=start)
+
+        return self.words[start:end]
+
+    def remember(self, query, delta, match):
+        """Store an answer of autocorrect(), emptying answers if full
+
+        Args:
+            query (unicode): lowercase query
+
+            delta (float): minimum similarity match was found with
+
+            match (unicode): best match, None if nothing matched
+
+        Returns:
+            unicode: match
+        """
+
+        if len(self.answers) >= MAX_ANSWERS:
+            self.answers.clear()
+        self.answers[(query, delta)] = match
+
+        return match
+
+
 def autocorrect(query, possibilities, delta=0.75):
     """Attempts to figure out what possibility the query is
 
     Args:
         query (unicode): query to attempt to complete
 
-        possibilities (list): list of unicodes of possible answers for query
+        possibilities (iterable): unicodes of possible answers for query,
+                                  a tuple, frozenset or Vocabulary is only
+                                  lowercased on the first call
 
         delta (float): minimum delta similarity between query and
                        any given possibility for possibility to be considered.
-                       Delta used by difflib.get_close_matches().
+                       Delta used by rapidfuzz if installed, else by
+                       difflib.get_close_matches().
 
     Returns:
         unicode: best guess of correct answer
 
     Raises:
-        AssertionError: raised if no matches found
+        ValueError: raised if no matches found
 
     Example:
     >>> autocomplete('bowtei', ['bowtie2', 'bot']
     'bowtie2'
     """
 
-    possibilities = [possibility.lower() for possibility in possibilities]
+    # Lowercase the query once too, exact and prefix tests compare it
+    # against lowercase possibilities
+    query = query.lower()
+    vocabulary = vocabulary_for(possibilities)
 
     # Don't waste time for exact matches
-    if query in possibilities:
+    if query in vocabulary.lookup:
         return query
 
-    # Complete query as much as possible
-    options = [word for word in possibilities if word.startswith(query)]
-    if len(options) > 0:
+    # Fuzzy matching is slow, reuse any earlier answer for these words
+    key = (query, delta)
+    if key in vocabulary.answers:
+        match = vocabulary.answers[key]
+    else:
+        match = vocabulary.remember(query, delta,
+                                    closest_match(query, vocabulary, delta))
+
+    if match is None:
+        raise ValueError('No matches for "{0}" found'.format(query))
+
+    return match
+
+
+def autocorrect_many(queries, possibilities, delta=0.75):
+    """Attempts to figure out what possibility each query is
+
+    Gives the same answers as calling autocorrect() on every query, but if
+    rapidfuzz and NumPy are installed all queries that must be compared to
+    every possibility are scored by a single multi-threaded cdist() call.
+
+    Args:
+        queries (iterable): unicodes of queries to attempt to complete
+
+        possibilities (iterable): unicodes of possible answers for query,
+                                  see autocorrect()
+
+        delta (float): minimum delta similarity between a query and
+                       any given possibility for possibility to be considered
+
+    Returns:
+        list: best guess of correct answer for each query in order, None
+              where no possibility is similar enough
+
+    Example:
+    >>> autocorrect_many(['bowtei', 'bwa'], ['bowtie2', 'bwa', 'bot'])
+    ['bowtie2', 'bwa']
+    """
+
+    vocabulary = vocabulary_for(possibilities)
+    queries = [query.lower() for query in queries]
+
+    # Answer queries like autocorrect() would, except for those without
+    # prefix completions which are set aside to be scored together. Answers
+    # are kept here too as vocabulary.answers may be emptied meanwhile.
+    results = {}
+    batch = []
+    for query in queries:
+        key = (query, delta)
+        if query in results:
+            continue
+        elif query in vocabulary.lookup:
+            results[query] = query
+        elif key in vocabulary.answers:
+            results[query] = vocabulary.answers[key]
+        elif len(vocabulary.words) > 0 \
+                and len(vocabulary.find_prefix(query)) == 0:
+            results[query] = None
+            batch.append(query)
+        else:
+            results[query] = vocabulary.remember(
+                query, delta, closest_match(query, vocabulary, delta))
+
+    if len(batch) > 0:
+        # cdist() imports NumPy when called, rapidfuzz doesn't require it
+        try:
+            from rapidfuzz import fuzz, process
+            scores = process.cdist(batch, vocabulary.words,
+                                   scorer=fuzz.ratio,
+                                   score_cutoff=delta * 100, workers=-1)
+        except ImportError:
+            for query in batch:
+                results[query] = vocabulary.remember(
+                    query, delta, closest_match(query, vocabulary, delta))
+        else:
+            # Ties go to the greatest word as in closest_match(), words are
+            # sorted so that is the last best score in each row
+            last = len(vocabulary.words) - 1
+            for query, row in zip(batch, scores):
+                best = last - int(row[::-1].argmax())
+                results[query] = vocabulary.remember(
+                    query, delta, vocabulary.words[best]
+                    if row[best] >= delta * 100 else None)
+
+    return [results[query] for query in queries]
+
+
+def closest_match(query, vocabulary, delta):
+    """Find the possibility most similar to query, see autocorrect()
+
+    Args:
+        query (unicode): lowercase query that is not a possibility
+
+        vocabulary (Vocabulary): lowercase possibilities
+
+        delta (float): minimum similarity of a match
+
+    Returns:
+        unicode: best match, None if no possibility is similar enough
+    """
+
+    # Complete query as much as possible, a unique completion is what the
+    # matchers would pick with a perfect score
+    options = vocabulary.find_prefix(query)
+    if len(options) == 1:
+        return options[0]
+    elif len(options) > 0:
         possibilities = options  # possibilities now limited to options
         query = max_substring(options)
+    else:
+        possibilities = vocabulary.words
 
-    # Identify possible matches and return best match
-    matches = get_close_matches(query, possibilities, cutoff=delta)
-
+    # Matchers are imported on the first fuzzy match. Their scores can
+    # differ slightly, but ties go to the greatest word with either one.
     try:
-        assert len(matches) > 0
-    except AssertionError:
-        raise AssertionError('No matches for "{0}" found'.format(query))
+        from rapidfuzz import fuzz, process
+    except ImportError:
+        # CyDifflib is difflib compiled with Cython, it gives identical
+        # results
+        try:
+            from cydifflib import get_close_matches
+        except ImportError:
+            from difflib import get_close_matches
+        matches = get_close_matches(query, possibilities, cutoff=delta)
+        return matches[0] if matches else None
 
-    return matches[0]
+    hits = process.extract(query, possibilities, scorer=fuzz.ratio,
+                           score_cutoff=delta * 100, limit=None)
+
+    return max(hits, key=lambda hit: (hit[1], hit[0]))[0] if hits else None
 
 
 def max_substring(words, last_letter='', position=0):
@@ -132,9 +331,9 @@ def max_substring(words, last_letter='', position=0):
     Args:
         words (list): list of unicode of all words to compare
 
-        last_letter (unicode): letter of last common letter, only for use
-                               internally unless you really know what
-                               you are doing
+        last_letter (unicode): string to prepend to the substring, kept for
+                               compatibility with the former recursive
+                               implementation
 
         position (int): starting position in each word to begin analyzing
                         for substring
@@ -151,16 +350,42 @@ def max_substring(words, last_letter='', position=0):
     ''
     """
 
-    # If end of word is reached, begin reconstructing the substring
-    try:
-        letter = [word[position] for word in words]
-    except IndexError:
-        return last_letter
-
-    # Recurse if position matches, else begin reconstructing the substring
-    if all(l == letter[0] for l in letter) is True:
-        last_letter += max_substring(words, last_letter=letter[0],
-                                     position=position + 1)
-        return last_letter
-    else:
-        return last_letter
+    # A single word, as for an unambiguous prefix, is its own substring
+    if len(words) == 1:
+        return last_letter + words[0][position:]
+
+    if position > 0:
+        words = [word[position:] for word in words]
+
+    # commonprefix() only compares the least and greatest word, any prefix
+    # they share is shared by every word sorted between them
+    return last_letter + os.path.commonprefix(list(words))
+
+
+def vocabulary_for(possibilities):
+    """Return the Vocabulary of possibilities, reusing it where possible
+
+    Tuples and frozensets can't change, so their Vocabulary is cached and
+    repeated calls with the same object skip lowercasing it again. Other
+    iterables are lowercased on every call.
+
+    Args:
+        possibilities (iterable): unicodes of possible answers, or a
+                                  Vocabulary which is returned as is
+
+    Returns:
+        Vocabulary: lowercase possibilities
+    """
+
+    if isinstance(possibilities, Vocabulary):
+        return possibilities
+    elif not isinstance(possibilities, (tuple, frozenset)):
+        return Vocabulary(possibilities)
+
+    key = id(possibilities)
+    if key not in VOCABULARIES:
+        if len(VOCABULARIES) >= MAX_VOCABULARIES:
+            VOCABULARIES.clear()
+        VOCABULARIES[key] = (possibilities, Vocabulary(possibilities))
+
+    return VOCABULARIES[key][1]
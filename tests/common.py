@@ -0,0 +1,64 @@
+#! /usr/bin/env python
+
+"""
+Test case running jarvis.old.py on a temporary database
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+JARVIS = os.path.join(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))), 'jarvis', 'jarvis.old.py')
+
+
+class JarvisTestCase(unittest.TestCase):
+    """Writes DATABASE to a temporary directory before every test
+
+    Attributes:
+
+        database (unicode): path of the temporary JSON database
+
+        directory (TemporaryDirectory): directory holding the database
+    """
+
+    DATABASE = {}
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.database = os.path.join(self.directory.name, 'db.json')
+        with open(self.database, 'w') as handle:
+            json.dump(self.DATABASE, handle)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def jarvis(self, *args, returncode=0, database=None):
+        """Run jarvis.old.py on the test database and return its output
+
+        Args:
+
+            args (unicode): command line arguments before the database
+
+            returncode (int): exit status jarvis.old.py must return
+
+            database (unicode): path passed to --database instead of the
+                                test database
+        """
+
+        database = self.database if database is None else database
+        process = subprocess.run([sys.executable, JARVIS] + list(args)
+                                 + ['-b', database, '--no-cache'],
+                                 capture_output=True, text=True)
+        self.assertEqual(process.returncode, returncode, process.stderr)
+
+        return process.stdout
+
+    def load(self, path=None):
+        """Return the parsed contents of the test database"""
+
+        with open(self.database if path is None else path) as handle:
+            return json.load(handle)
@@ -0,0 +1,27 @@
+#! /usr/bin/env python
+
+"""
+Tests for the command line parsing of jarvis.old.py
+"""
+
+import subprocess
+import sys
+import unittest
+
+from common import JARVIS
+
+
+class TestCommandLine(unittest.TestCase):
+    """jarvis.old.py rejects command lines without a subcommand"""
+
+    def test_no_arguments(self):
+        process = subprocess.run([sys.executable, JARVIS],
+                                 capture_output=True, text=True)
+
+        self.assertEqual(process.returncode, 2)
+        self.assertIn('required', process.stderr)
+        self.assertNotIn('Traceback', process.stderr)
+
+
+if __name__ == '__main__':
+    unittest.main()
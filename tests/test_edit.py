@@ -0,0 +1,82 @@
+#! /usr/bin/env python
+
+"""
+Tests for "jarvis edit" in jarvis.old.py
+"""
+
+import os
+import unittest
+
+from common import JarvisTestCase
+
+
+class TestEdit(JarvisTestCase):
+    """edit changes only the requested attributes of the database"""
+
+    DATABASE = {
+        'bwa': {
+            'categories': ['alignment'],
+            'commands': ['bwa'],
+            'dependencies': [],
+            'description': 'Burrows-Wheeler Aligner',
+            'installation method': 'conda',
+            'previous versions': [],
+            'version': '0.7.15',
+        },
+    }
+
+    def test_edit_version(self):
+        self.jarvis('edit', 'bwa', '-e', '-v', '9.9')
+
+        expected = dict(self.DATABASE['bwa'], version='9.9')
+        self.assertEqual(self.load(), {'bwa': expected})
+
+    def test_extend_list(self):
+        self.jarvis('edit', 'bwa', '-e', '-c', '+,bwa-mem,bwa-aln')
+
+        self.assertEqual(self.load()['bwa']['commands'],
+                         ['bwa', 'bwa-mem', 'bwa-aln'])
+
+    def test_clear(self):
+        self.jarvis('edit', 'bwa', '-e', '-c', '-', '-i', '-')
+
+        entry = self.load()['bwa']
+        self.assertEqual(entry['commands'], [])
+        self.assertEqual(entry['installation method'], '')
+        self.assertEqual(entry['categories'], ['alignment'])
+
+    def test_append(self):
+        self.jarvis('edit', 'samtools', '-a', '-v', '1.3', '-s',
+                    'SAM utilities', '-d', 'zlib,htslib')
+
+        data = self.load()
+        self.assertEqual(data['bwa'], self.DATABASE['bwa'])
+        self.assertEqual(data['samtools'], {
+            'categories': [],
+            'commands': [],
+            'dependencies': ['zlib', 'htslib'],
+            'description': 'SAM utilities',
+            'installation method': '',
+            'previous versions': [],
+            'version': '1.3',
+        })
+
+    def test_no_change(self):
+        before = os.stat(self.database)
+        self.jarvis('edit', 'bwa', '-e')
+        after = os.stat(self.database)
+
+        self.assertEqual((before.st_ino, before.st_mtime_ns),
+                         (after.st_ino, after.st_mtime_ns))
+
+    def test_symlink(self):
+        link = os.path.join(self.directory.name, 'link.json')
+        os.symlink(self.database, link)
+        self.jarvis('edit', 'bwa', '-e', '-v', '9.9', database=link)
+
+        self.assertTrue(os.path.islink(link))
+        self.assertEqual(self.load()['bwa']['version'], '9.9')
+
+
+if __name__ == '__main__':
+    unittest.main()
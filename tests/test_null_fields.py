@@ -0,0 +1,42 @@
+#! /usr/bin/env python
+
+"""
+Regression tests for databases holding null attributes in jarvis.old.py
+
+Past releases of "jarvis edit" wrote null versions, descriptions and
+installation methods when their flags were left out.
+"""
+
+import unittest
+
+from common import JarvisTestCase
+
+
+class TestNullFields(JarvisTestCase):
+    """Every reading command prints software with null attributes"""
+
+    DATABASE = {
+        'samtools': {
+            'categories': ['alignment'],
+            'commands': [],
+            'dependencies': [],
+            'description': None,
+            'installation method': None,
+            'previous versions': [],
+            'version': None,
+        },
+    }
+
+    def test_list(self):
+        self.assertEqual(self.jarvis('list'), 'samtools\n')
+
+    def test_list_categories(self):
+        self.assertIn('samtools\n', self.jarvis('list', '-c', 'alignment'))
+
+    def test_show_installation(self):
+        self.assertEqual(self.jarvis('show', 'samtools', '-i'),
+                         'samtools\ninstallation method:  N/A\n')
+
+
+if __name__ == '__main__':
+    unittest.main()